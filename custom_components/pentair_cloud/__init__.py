@@ -1,28 +1,74 @@
 """The Pentair integration."""
 from __future__ import annotations
 
+from importlib import import_module
 import logging
 
-from pypentair import Pentair, PentairAuthenticationError
+import voluptuous as vol
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import CONF_ACCESS_TOKEN, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-
-from .const import CONF_ID_TOKEN, CONF_REFRESH_TOKEN, DOMAIN
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_END_TIME,
+    ATTR_START_TIME,
+    CONF_ID_TOKEN,
+    CONF_REFRESH_TOKEN,
+    DOMAIN,
+    SERVICE_BACKFILL_STATISTICS,
+)
 from .entity import PentairDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.BINARY_SENSOR, Platform.SELECT, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+BACKFILL_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START_TIME): cv.datetime,
+        vol.Optional(ATTR_END_TIME): cv.datetime,
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Pentair services."""
+
+    async def backfill_statistics(call: ServiceCall) -> None:
+        """Backfill long-term statistics from Pentair device history."""
+        backfill = await hass.async_add_executor_job(
+            import_module, f"{__name__}.backfill"
+        )
+        start_time = dt_util.as_utc(call.data[ATTR_START_TIME])
+        end_time = dt_util.as_utc(call.data.get(ATTR_END_TIME, dt_util.utcnow()))
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            if entry.state is ConfigEntryState.LOADED:
+                await backfill.async_backfill_statistics(
+                    hass, hass.data[DOMAIN][entry.entry_id], start_time, end_time
+                )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKFILL_STATISTICS,
+        backfill_statistics,
+        schema=BACKFILL_STATISTICS_SCHEMA,
+    )
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Pentair from a config entry."""
     entry.add_update_listener(update_listener)
 
-    client = Pentair(
+    pypentair = await hass.async_add_executor_job(import_module, "pypentair")
+    client = pypentair.Pentair(
         username=entry.data.get(CONF_USERNAME),
         access_token=entry.data.get(CONF_ACCESS_TOKEN),
         id_token=entry.data.get(CONF_ID_TOKEN),
@@ -31,7 +77,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     try:
         await hass.async_add_executor_job(client.get_auth)
-    except PentairAuthenticationError as err:
+    except pypentair.PentairAuthenticationError as err:
         raise ConfigEntryAuthFailed(err) from err
     except Exception as ex:
         raise ConfigEntryNotReady(ex) from ex
@@ -49,12 +95,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
     return unload_ok
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle removal of an entry."""
-    hass.data[DOMAIN].pop(entry.entry_id)
+    hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
 
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -0,0 +1,252 @@
+"""Pentair history backfill into long-term statistics.
+
+Backs the `backfill_statistics` service. History comes from the client's
+`get_device_history(device_id, start, end)`, an iterable of records shaped like
+device payloads: a `lastReport` timestamp plus the same camelCase fields the
+device exposes. Released pypentair clients do not have it yet, in which case the
+service raises an error.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Final
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    STATISTIC_UNIT_TO_UNIT_CONVERTER,
+    async_add_external_statistics,
+    async_import_statistics,
+)
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    PERCENTAGE,
+    Platform,
+    UnitOfPower,
+    UnitOfVolumeFlowRate,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .coordinator import PentairDataUpdateCoordinator
+from .util import report_timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+# History is fetched and imported one chunk at a time, and each chunk is written
+# before the next is fetched, so at most one chunk's hourly buckets per device
+# are held in memory or queued in the recorder.
+BACKFILL_CHUNK: Final = timedelta(days=1)
+
+# (sensor key, history field, native unit of measurement) per device type.
+HISTORY_FIELDS: Final[dict[str, tuple[tuple[str, str, str | None], ...]]] = {
+    "IF31": (
+        ("current_power_consumption", "currentPowerConsumption", UnitOfPower.WATT),
+        ("current_motor_speed", "currentMotorSpeed", PERCENTAGE),
+        (
+            "current_estimated_flow",
+            "currentEstimatedFlow",
+            UnitOfVolumeFlowRate.GALLONS_PER_MINUTE,
+        ),
+    ),
+    "SSS1": (("salt_level", "saltLevel", None),),
+}
+
+
+def _floor_hour(value: datetime) -> datetime:
+    """Round a datetime down to the start of its hour."""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def aggregate_history(
+    records: Iterable[dict[str, Any]],
+    fields: tuple[tuple[str, str, str | None], ...],
+    start: datetime,
+    end: datetime,
+) -> dict[str, list[StatisticData]]:
+    """Aggregate history records in [start, end) into hourly statistics per key."""
+    buckets: dict[str, dict[datetime, list[float]]] = {key: {} for key, _, _ in fields}
+    for record in records:
+        if (timestamp := report_timestamp(record.get("lastReport"))) is None:
+            continue
+        if not start <= (reported := dt_util.utc_from_timestamp(timestamp)) < end:
+            continue
+        hour = _floor_hour(reported)
+        for key, field, _ in fields:
+            if (value := record.get(field)) is None:
+                continue
+            value = float(value)
+            if (bucket := buckets[key].get(hour)) is None:
+                buckets[key][hour] = [1, value, value, value]
+            else:
+                bucket[0] += 1
+                bucket[1] += value
+                bucket[2] = min(bucket[2], value)
+                bucket[3] = max(bucket[3], value)
+
+    return {
+        key: [
+            StatisticData(start=hour, mean=total / count, min=low, max=high)
+            for hour, (count, total, low, high) in sorted(hours.items())
+        ]
+        for key, hours in buckets.items()
+    }
+
+
+def _statistic_metadata(
+    hass: HomeAssistant, device: Any, key: str, native_unit: str | None
+) -> tuple[StatisticMetaData, str | None] | None:
+    """Return statistic metadata for a key and the unit to import it in.
+
+    Registered sensors are backfilled into their own recorder statistics, in the
+    unit their state is shown in. Sensors without a state class are skipped since
+    the recorder never compiles statistics for them, as are sensors whose unit
+    cannot be converted to. Unregistered sensors get external statistics.
+    """
+    registry = er.async_get(hass)
+    if (
+        entity_id := registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, f"{device.deviceId}-{key}"
+        )
+    ) is None:
+        return (
+            StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{device.nickName} {key.replace('_', ' ')}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{slugify(f'{device.deviceId}_{key}')}",
+                unit_of_measurement=native_unit,
+            ),
+            native_unit,
+        )
+
+    entry = registry.async_get(entity_id)
+    if not (entry.capabilities or {}).get("state_class"):
+        return None
+
+    if state := hass.states.get(entity_id):
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    else:
+        unit = entry.unit_of_measurement or native_unit
+    if unit != native_unit and not (
+        (converter := STATISTIC_UNIT_TO_UNIT_CONVERTER.get(native_unit))
+        and unit in converter.VALID_UNITS
+    ):
+        _LOGGER.debug("Skipping backfill of %s; cannot convert to %s", entity_id, unit)
+        return None
+
+    return (
+        StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=None,
+            source="recorder",
+            statistic_id=entity_id,
+            unit_of_measurement=unit,
+        ),
+        unit,
+    )
+
+
+def _convert_rows(
+    rows: list[StatisticData], native_unit: str | None, unit: str | None
+) -> list[StatisticData]:
+    """Convert statistic rows from the native unit to the import unit."""
+    if unit == native_unit:
+        return rows
+    converter = STATISTIC_UNIT_TO_UNIT_CONVERTER[native_unit]
+    return [
+        StatisticData(
+            start=row["start"],
+            **{
+                field: converter.convert(row[field], native_unit, unit)
+                for field in ("mean", "min", "max")
+            },
+        )
+        for row in rows
+    ]
+
+
+async def async_backfill_statistics(
+    hass: HomeAssistant,
+    coordinator: PentairDataUpdateCoordinator,
+    start_time: datetime,
+    end_time: datetime,
+) -> None:
+    """Backfill long-term statistics for pump and salt sensors from device history.
+
+    The range is widened to whole hours so every imported bucket is complete,
+    and ends at the last completed hour since the current one is still being
+    recorded; statistics are keyed by hour, so importing the same range again
+    replaces the existing rows instead of duplicating them.
+    """
+    if not hasattr(coordinator.api, "get_device_history"):
+        raise HomeAssistantError("Pentair client does not support device history")
+
+    start = _floor_hour(dt_util.as_utc(start_time))
+    end = dt_util.as_utc(end_time)
+    if end > _floor_hour(end):
+        end = _floor_hour(end) + timedelta(hours=1)
+    end = min(end, _floor_hour(dt_util.utcnow()))
+    if start >= end:
+        raise HomeAssistantError(
+            "Backfill start time must be before the last completed hour"
+        )
+
+    for device in coordinator.get_devices():
+        if (fields := HISTORY_FIELDS.get(device.deviceType)) is None:
+            continue
+
+        metadata = {
+            key: result
+            for key, _, native_unit in fields
+            if (result := _statistic_metadata(hass, device, key, native_unit))
+        }
+        if not metadata:
+            continue
+        fields = tuple(field for field in fields if field[0] in metadata)
+
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(chunk_start + BACKFILL_CHUNK, end)
+            statistics = await hass.async_add_executor_job(
+                _fetch_and_aggregate,
+                coordinator,
+                device.deviceId,
+                fields,
+                chunk_start,
+                chunk_end,
+            )
+            for key, _, native_unit in fields:
+                if not (rows := statistics[key]):
+                    continue
+                meta, unit = metadata[key]
+                rows = _convert_rows(rows, native_unit, unit)
+                if meta["source"] == DOMAIN:
+                    async_add_external_statistics(hass, meta, rows)
+                else:
+                    async_import_statistics(hass, meta, rows)
+            await get_instance(hass).async_block_till_done()
+            _LOGGER.debug(
+                "Backfilled %s from %s to %s", device.deviceId, chunk_start, chunk_end
+            )
+            chunk_start = chunk_end
+
+
+def _fetch_and_aggregate(
+    coordinator: PentairDataUpdateCoordinator,
+    device_id: str,
+    fields: tuple[tuple[str, str, str | None], ...],
+    start: datetime,
+    end: datetime,
+) -> dict[str, list[StatisticData]]:
+    """Fetch a chunk of device history and aggregate it without buffering records."""
+    return aggregate_history(
+        coordinator.api.get_device_history(device_id, start, end), fields, start, end
+    )
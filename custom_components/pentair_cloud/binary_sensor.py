@@ -3,8 +3,6 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime
-from time import time
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -15,7 +13,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util.dt import UTC
 
 from .const import DOMAIN
 from .entity import PentairDataUpdateCoordinator, PentairEntity
@@ -35,11 +32,6 @@ class PentairBinarySensorEntityDescription(
     """Pentair binary sensor entity description."""
 
 
-def convert_timestamp(_ts: float) -> datetime:
-    """Convert a timestamp to a datetime."""
-    return datetime.fromtimestamp(_ts / (1000 if _ts > time() else 1), UTC)
-
-
 SENSOR_MAP: dict[str | None, tuple[PentairBinarySensorEntityDescription, ...]] = {
     "PPA0": (
         PentairBinarySensorEntityDescription(
@@ -1,10 +1,10 @@
 """Pentair config flow."""
 from __future__ import annotations
 
+from importlib import import_module
 import logging
 from typing import Any
 
-from pypentair import Pentair, PentairAuthenticationError
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigFlow
@@ -47,12 +47,13 @@ class PentairConfigFlow(ConfigFlow, domain=DOMAIN):
         """Attempt a login with Pentair."""
         errors = {}
 
-        pentair = Pentair(username=user_input[CONF_USERNAME])
+        pypentair = await self.hass.async_add_executor_job(import_module, "pypentair")
+        pentair = pypentair.Pentair(username=user_input[CONF_USERNAME])
         try:
             await self.hass.async_add_executor_job(
                 pentair.authenticate, user_input[CONF_PASSWORD]
             )
-        except PentairAuthenticationError:
+        except pypentair.PentairAuthenticationError:
             errors["base"] = "invalid_auth"
         except Exception as ex:  # pylint: disable=broad-except
             _LOGGER.exception(ex)
@@ -7,3 +7,7 @@ DOMAIN: Final = "pentair_cloud"
 
 CONF_ID_TOKEN: Final = "id_token"
 CONF_REFRESH_TOKEN: Final = "refresh_token"
+
+SERVICE_BACKFILL_STATISTICS: Final = "backfill_statistics"
+ATTR_START_TIME: Final = "start_time"
+ATTR_END_TIME: Final = "end_time"
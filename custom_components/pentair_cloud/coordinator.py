@@ -2,20 +2,27 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from importlib import import_module
 import logging
-from typing import Any, List
-
-from deepdiff import DeepDiff
-from pypentair import Pentair, PentairDevice
+from time import time
+from typing import TYPE_CHECKING, Any, List
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import DOMAIN
+from .util import report_timestamp
+
+if TYPE_CHECKING:
+    from pypentair import Pentair, PentairDevice
 
 _LOGGER = logging.getLogger(__name__)
 UPDATE_INTERVAL = 30
 
+# Successful polls further apart than this mean polls were missed, and pump power
+# during the gap is not integrated into the energy total.
+ENERGY_MAX_POLL_GAP = timedelta(seconds=4 * UPDATE_INTERVAL)
+
 
 class PentairDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
@@ -24,6 +31,10 @@ class PentairDataUpdateCoordinator(DataUpdateCoordinator):
         """Initialize."""
         self.api = client
         self.devices: List(PentairDevice) = []
+        self._energy: dict[str, float] = {}
+        self._energy_restored: set[str] = set()
+        self._power_samples: dict[str, tuple[float, float]] = {}
+        self._last_poll: float | None = None
 
         super().__init__(
             hass,
@@ -47,6 +58,63 @@ class PentairDataUpdateCoordinator(DataUpdateCoordinator):
             if device_type is None or device.deviceType == device_type
         ]
 
+    def get_energy(self, device_id: str) -> float | None:
+        """Get the accumulated pump energy in kWh for a device, if known."""
+        return self._energy.get(device_id)
+
+    def restore_energy(self, device_id: str, energy: float) -> None:
+        """Restore a device's energy total from a previous run, once per device."""
+        if device_id in self._energy_restored:
+            return
+        self._energy_restored.add(device_id)
+        self._energy[device_id] = energy
+
+    def _integrate_energy(self) -> None:
+        """Integrate pump power samples into energy totals.
+
+        Each new `lastReport` closes the interval since the previous report, and
+        the power seen at the start of that interval is held across it, since pump
+        power changes in steps when the speed or program changes. A pump running
+        steadily may report rarely; as long as every poll succeeded, the held power
+        is known to cover the whole interval. If polls were missed (no successful
+        poll within `ENERGY_MAX_POLL_GAP`), the interval is cut at the `lastReport`
+        seen at the last successful poll, which is where it started, so none of it
+        is counted since the power during the outage is unknown. Missed polls are
+        detected on local time and intervals are cut on the cloud's report time, so
+        the two clocks are never compared.
+        """
+        now = time()
+        missed_polls = (
+            self._last_poll is not None
+            and now - self._last_poll > ENERGY_MAX_POLL_GAP.total_seconds()
+        )
+        for device in self.get_devices("IF31"):
+            device_id = device.deviceId
+            if (power := device.currentPowerConsumption) is None or (
+                report_time := report_timestamp(device.lastReport)
+            ) is None:
+                continue
+
+            self._energy.setdefault(device_id, 0.0)
+            previous = self._power_samples.get(device_id)
+            if previous is not None:
+                # The sample holds the lastReport seen at the last successful poll.
+                previous_time, previous_power = previous
+                if report_time == previous_time:
+                    continue
+                if missed_polls:
+                    _LOGGER.debug(
+                        "Missed polls for %s; not counting energy since %s",
+                        device_id,
+                        previous_time,
+                    )
+                elif report_time > previous_time:
+                    self._energy[device_id] += (
+                        previous_power * (report_time - previous_time) / 3_600_000
+                    )
+            self._power_samples[device_id] = (report_time, float(power))
+        self._last_poll = now
+
     async def change_active_pump_program(
         self, device: PentairDevice, programName: str
     ) -> None:
@@ -74,15 +142,23 @@ class PentairDataUpdateCoordinator(DataUpdateCoordinator):
                         )
                     )
 
-                diff = DeepDiff(
-                    self.devices,
-                    enrichedDevices,
-                    ignore_order=True,
-                    report_repetition=True,
-                    verbose_level=2,
-                )
-                _LOGGER.debug("Devices updated: %s", diff if diff else "no changes")
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    # deepdiff is only needed for this log line, so it is imported
+                    # (off the event loop) and the diff computed only when debug
+                    # logging is enabled.
+                    deepdiff = await self.hass.async_add_executor_job(
+                        import_module, "deepdiff"
+                    )
+                    diff = deepdiff.DeepDiff(
+                        self.devices,
+                        enrichedDevices,
+                        ignore_order=True,
+                        report_repetition=True,
+                        verbose_level=2,
+                    )
+                    _LOGGER.debug("Devices updated: %s", diff if diff else "no changes")
                 self.devices = enrichedDevices
+                self._integrate_energy()
         except Exception as err:  # pylint: disable=broad-except
             _LOGGER.error(
                 "Unknown exception while updating Pentair data: %s", err, exc_info=1
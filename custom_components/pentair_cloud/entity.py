@@ -1,9 +1,7 @@
 """Pentair entities."""
 from __future__ import annotations
 
-from typing import Any
-
-from pypentair import PentairDevice
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo, EntityDescription
@@ -12,6 +10,9 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
 from .coordinator import PentairDataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from pypentair import PentairDevice
+
 
 class PentairEntity(CoordinatorEntity[PentairDataUpdateCoordinator]):
     """Base class for Pentair entities."""
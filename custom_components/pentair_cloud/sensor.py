@@ -4,10 +4,10 @@ from __future__ import annotations
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
-from time import time
 from typing import Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
@@ -17,13 +17,13 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
     EntityCategory,
+    UnitOfEnergy,
     UnitOfMass,
     UnitOfPower,
     UnitOfVolumeFlowRate,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util.dt import UTC
 
 from .const import DOMAIN
 from .entity import PentairDataUpdateCoordinator, PentairEntity
@@ -41,11 +41,6 @@ class PentairSensorEntityDescription(SensorEntityDescription, RequiredKeysMixin)
     """Pentair sensor entity description."""
 
 
-def convert_timestamp(_ts: float) -> datetime:
-    """Convert a timestamp to a datetime."""
-    return datetime.fromtimestamp(_ts / (1000 if _ts > time() else 1), UTC)
-
-
 SENSOR_MAP: dict[str | None, tuple[PentairSensorEntityDescription, ...]] = {
     None: (
         PentairSensorEntityDescription(
@@ -85,6 +80,7 @@ SENSOR_MAP: dict[str | None, tuple[PentairSensorEntityDescription, ...]] = {
         ),
         PentairSensorEntityDescription(
             key="salt_level",
+            state_class=SensorStateClass.MEASUREMENT,
             translation_key="salt_level",
             value_fn=lambda device: device.saltLevel,
         ),
@@ -127,6 +123,18 @@ SENSOR_MAP: dict[str | None, tuple[PentairSensorEntityDescription, ...]] = {
 }
 
 
+ENERGY_SENSOR_MAP: dict[str, SensorEntityDescription] = {
+    "IF31": SensorEntityDescription(
+        key="energy",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=3,
+        translation_key="energy",
+    ),
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -147,6 +155,16 @@ async def async_setup_entry(
         for description in descriptions
         if device_type is None or device.deviceType == device_type
     ]
+    entities.extend(
+        PentairEnergySensorEntity(
+            coordinator=coordinator,
+            config_entry=config_entry,
+            description=ENERGY_SENSOR_MAP[device.deviceType],
+            device_id=device.deviceId,
+        )
+        for device in coordinator.get_devices()
+        if device.deviceType in ENERGY_SENSOR_MAP
+    )
 
     if not entities:
         return
@@ -163,3 +181,22 @@ class PentairSensorEntity(PentairEntity, SensorEntity):
     def native_value(self) -> str | int | datetime | None:
         """Return the value reported by the sensor."""
         return self.entity_description.value_fn(self.get_device())
+
+
+class PentairEnergySensorEntity(PentairEntity, RestoreSensor):
+    """Pentair energy sensor entity, integrated by the coordinator from power."""
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the energy total from the previous run."""
+        await super().async_added_to_hass()
+        if (
+            last_sensor_data := await self.async_get_last_sensor_data()
+        ) is not None and last_sensor_data.native_value is not None:
+            self.coordinator.restore_energy(
+                self._device_id, float(last_sensor_data.native_value)
+            )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the accumulated energy."""
+        return self.coordinator.get_energy(self._device_id)
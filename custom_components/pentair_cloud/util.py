@@ -0,0 +1,21 @@
+"""Pentair utilities."""
+from __future__ import annotations
+
+from datetime import datetime
+from time import time
+
+from homeassistant.util.dt import UTC
+
+
+def convert_timestamp(_ts: float) -> datetime:
+    """Convert a timestamp to a datetime."""
+    return datetime.fromtimestamp(_ts / (1000 if _ts > time() else 1), UTC)
+
+
+def report_timestamp(last_report: datetime | float | None) -> float | None:
+    """Convert a `lastReport` value to a POSIX timestamp in seconds."""
+    if last_report is None:
+        return None
+    if not isinstance(last_report, datetime):
+        last_report = convert_timestamp(last_report)
+    return last_report.timestamp()
@@ -0,0 +1,230 @@
+"""Benchmark Pentair integration import and startup time against a fake client.
+
+Run from the repository root with the development requirements installed. Save
+a baseline from a known-good checkout, then compare a change against it on the
+same machine:
+
+    python3 scripts/benchmark_startup.py --save-baseline baseline.json
+    python3 scripts/benchmark_startup.py --baseline baseline.json
+
+Exits non-zero if either median exceeds its baseline by more than the tolerance,
+or if importing the integration loads a module that should only load on first
+use. Without a baseline, the times are only reported.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+from importlib import import_module
+import json
+from pathlib import Path
+from statistics import median
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+import time
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Wall-clock times do not carry across machines, so budgets are relative to a
+# baseline taken on the same machine. The absolute slack keeps millisecond-scale
+# medians from failing on scheduler noise: on Home Assistant 2024.3.3 the import
+# median is about 0.007s and setup about 0.03s, while an eager pypentair or
+# deepdiff import adds 0.15s or more.
+RUNS = 5
+TOLERANCE = 1.5
+SLACK = 0.02
+
+LAZY_MODULES = ("deepdiff", "pypentair", "custom_components.pentair_cloud.backfill")
+
+# Home Assistant itself is imported before the clock starts so only the
+# integration's own import cost is measured. Platform modules are derived from
+# the integration's PLATFORMS, so every forwarded platform is covered.
+IMPORT_SNIPPET = f"""
+import importlib, json, sys, time
+import homeassistant.core
+import homeassistant.components.binary_sensor
+import homeassistant.components.select
+import homeassistant.components.sensor
+import homeassistant.config_entries
+import homeassistant.helpers.config_validation
+import homeassistant.helpers.update_coordinator
+start = time.perf_counter()
+integration = importlib.import_module("custom_components.pentair_cloud")
+importlib.import_module("custom_components.pentair_cloud.config_flow")
+missing = []
+for platform in integration.PLATFORMS:
+    try:
+        importlib.import_module(f"custom_components.pentair_cloud.{{platform}}")
+    except ModuleNotFoundError:
+        missing.append(str(platform))
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "elapsed": elapsed,
+    "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules],
+    "missing": missing,
+}}))
+"""
+
+FAKE_DEVICES = (
+    {"deviceId": "fake-pump", "deviceType": "IF31", "nickName": "Pool pump"},
+    {"deviceId": "fake-salt", "deviceType": "SSS1", "nickName": "Salt tank"},
+    {"deviceId": "fake-pool", "deviceType": "PPA0", "nickName": "Pool alarm"},
+)
+
+
+class FakePentair:
+    """Fake Pentair client that answers from memory."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize."""
+
+    def get_auth(self) -> None:
+        """Pretend to authenticate."""
+
+    def get_devices(self) -> list[SimpleNamespace]:
+        """Return the fake devices."""
+        return [SimpleNamespace(**device) for device in FAKE_DEVICES]
+
+    def get_device(self, device_id: str) -> SimpleNamespace:
+        """Return a fully populated fake device."""
+        device = next(d for d in FAKE_DEVICES if d["deviceId"] == device_id)
+        return SimpleNamespace(
+            **device,
+            maker="Pentair",
+            model=device["deviceType"],
+            softwareVersion="1.0.0",
+            lastReport=datetime.now(UTC),
+            activeProgramNumber=1,
+            activeProgramName="Filter",
+            enabledPrograms=[SimpleNamespace(id=1, name="Filter")],
+            currentPowerConsumption=750,
+            currentMotorSpeed=60,
+            currentEstimatedFlow=45,
+            averageSaltUsagePerDay=0.5,
+            saltLevel=80,
+            batteryLevel=95,
+            lowBattery=False,
+            batteryCharging=False,
+            online=True,
+            power=True,
+            primaryPump=False,
+            secondaryPump=False,
+            waterLevel=False,
+        )
+
+
+def measure_import() -> dict[str, Any]:
+    """Measure integration import time in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+async def measure_setup() -> float:
+    """Measure time from entry setup to the first entity being available."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.core import Event, callback  # isort: skip
+    from homeassistant import loader
+    from homeassistant.config_entries import ConfigEntryState
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.helpers import recorder as recorder_helper
+    from homeassistant.setup import async_setup_component
+
+    from custom_components.pentair_cloud import PLATFORMS
+    from custom_components.pentair_cloud.const import DOMAIN
+    from pytest_homeassistant_custom_component.common import (
+        MockConfigEntry,
+        async_test_home_assistant,
+    )
+
+    # Import time is measured separately, so load the integration up front.
+    import_module("custom_components.pentair_cloud.config_flow")
+    for platform in PLATFORMS:
+        try:
+            import_module(f"custom_components.pentair_cloud.{platform}")
+        except ModuleNotFoundError:
+            pass
+
+    with TemporaryDirectory() as db_dir:
+        async with async_test_home_assistant() as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            # The recorder is a dependency; set it up before the clock starts.
+            recorder_helper.async_initialize_recorder(hass)
+            await async_setup_component(
+                hass,
+                "recorder",
+                {"recorder": {"db_url": f"sqlite:///{db_dir}/bench.db"}},
+            )
+            entry = MockConfigEntry(domain=DOMAIN, data={"username": "benchmark"})
+            entry.add_to_hass(hass)
+            first_entity: list[float] = []
+
+            @callback
+            def _state_changed(event: Event) -> None:
+                if not first_entity and event.data["new_state"] is not None:
+                    first_entity.append(time.perf_counter())
+
+            hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+
+            # Patching imports pypentair up front, so its import is not timed here.
+            with patch("pypentair.Pentair", FakePentair):
+                start = time.perf_counter()
+                await hass.config_entries.async_setup(entry.entry_id)
+                await hass.async_block_till_done()
+
+            if entry.state is not ConfigEntryState.LOADED or not first_entity:
+                raise RuntimeError(f"Setup did not add any entities ({entry.state})")
+            await hass.async_stop(force=True)
+    return first_entity[0] - start
+
+
+def main() -> int:
+    """Run the benchmark and compare against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    result = {
+        "import": median(imported["elapsed"] for imported in imports),
+        "setup": median(asyncio.run(measure_setup()) for _ in range(args.runs)),
+    }
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+
+    failures = []
+    for name, elapsed in result.items():
+        if name not in baseline:
+            print(f"{name}: {elapsed:.3f}s")
+            continue
+        budget = max(baseline[name] * args.tolerance, baseline[name] + SLACK)
+        print(f"{name}: {elapsed:.3f}s (baseline {baseline[name]:.3f}s)")
+        if elapsed > budget:
+            failures.append(f"{name} time over budget ({budget:.3f}s)")
+    if missing := imports[0]["missing"]:
+        print(f"platforms without a module: {', '.join(missing)}")
+    if loaded := imports[0]["loaded"]:
+        failures.append(f"eagerly imported: {', '.join(loaded)}")
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(result))
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+"""Tests for the Pentair history backfill."""
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from custom_components.pentair_cloud.backfill import (
+    BACKFILL_CHUNK,
+    HISTORY_FIELDS,
+    aggregate_history,
+    async_backfill_statistics,
+)
+from custom_components.pentair_cloud.const import (
+    ATTR_END_TIME,
+    ATTR_START_TIME,
+    DOMAIN,
+    SERVICE_BACKFILL_STATISTICS,
+)
+from custom_components.pentair_cloud.coordinator import PentairDataUpdateCoordinator
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+START = datetime(2024, 6, 1, tzinfo=UTC)
+PUMP_FIELDS = HISTORY_FIELDS["IF31"]
+DEVICES = (
+    {"deviceId": "pump", "deviceType": "IF31", "nickName": "Pool pump"},
+    {"deviceId": "salt", "deviceType": "SSS1", "nickName": "Salt tank"},
+)
+
+
+def _record(when: datetime, **fields: float) -> dict:
+    """Return a history record reported at `when`, in milliseconds like the API."""
+    return {"lastReport": when.timestamp() * 1000, **fields}
+
+
+class FakePentair:
+    """Fake Pentair cloud serving devices from memory."""
+
+    def get_auth(self) -> None:
+        """Pretend to authenticate."""
+
+    def get_devices(self) -> list[SimpleNamespace]:
+        """Return the devices."""
+        return [SimpleNamespace(**device) for device in DEVICES]
+
+    def get_device(self, device_id: str) -> SimpleNamespace:
+        """Return a device with its latest readings."""
+        device = next(d for d in DEVICES if d["deviceId"] == device_id)
+        return SimpleNamespace(
+            **device,
+            maker="Pentair",
+            model=device["deviceType"],
+            softwareVersion="1.0.0",
+            lastReport=START.timestamp() * 1000,
+            activeProgramNumber=1,
+            activeProgramName="Filter",
+            enabledPrograms=[],
+            currentPowerConsumption=1000,
+            currentMotorSpeed=50,
+            currentEstimatedFlow=40,
+            averageSaltUsagePerDay=0.5,
+            saltLevel=80,
+            batteryLevel=95,
+            lowBattery=False,
+            batteryCharging=False,
+            online=True,
+            power=True,
+            primaryPump=False,
+            secondaryPump=False,
+            waterLevel=False,
+        )
+
+
+class FakePentairCloud(FakePentair):
+    """Fake Pentair cloud that also serves device history from memory."""
+
+    def __init__(self, history: dict[str, list[dict]]) -> None:
+        """Initialize."""
+        self.history = history
+        self.calls: list[tuple[str, datetime, datetime]] = []
+
+    def get_device_history(self, device_id: str, start: datetime, end: datetime):
+        """Yield records between start and end, inclusive like the API."""
+        self.calls.append((device_id, start, end))
+        for record in self.history[device_id]:
+            if start.timestamp() <= record["lastReport"] / 1000 <= end.timestamp():
+                yield record
+
+
+def _history(hours: int) -> dict[str, list[dict]]:
+    """Return pump and salt history with a reading every 10 minutes."""
+    readings = [START + timedelta(minutes=10 * i) for i in range(hours * 6)]
+    return {
+        "pump": [
+            _record(
+                when,
+                currentPowerConsumption=1000 + when.hour,
+                currentMotorSpeed=50,
+                currentEstimatedFlow=40,
+            )
+            for when in readings
+        ],
+        "salt": [_record(when, saltLevel=80) for when in readings],
+    }
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_db_url, enable_custom_integrations):
+    """Enable custom integrations once the recorder database is prepared."""
+    yield
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant) -> PentairDataUpdateCoordinator:
+    """Return a coordinator with a pump and a salt tank backed by a fake cloud."""
+    coordinator = PentairDataUpdateCoordinator(
+        hass, client=FakePentairCloud(_history(60))
+    )
+    coordinator.devices = coordinator.api.get_devices()
+    return coordinator
+
+
+async def _statistics(
+    hass: HomeAssistant, start: datetime, end: datetime, statistic_ids: set[str]
+) -> dict:
+    """Return hourly statistics recorded between start and end."""
+    await async_wait_recording_done(hass)
+    return await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        start,
+        end,
+        statistic_ids,
+        "hour",
+        None,
+        {"mean", "min", "max"},
+    )
+
+
+def test_aggregate_history() -> None:
+    """Test records are bucketed by hour, cut to [start, end) and may miss fields."""
+    records = [
+        _record(START - timedelta(minutes=1), currentPowerConsumption=999),
+        _record(START + timedelta(minutes=5), currentPowerConsumption=100),
+        _record(START + timedelta(minutes=55), currentEstimatedFlow=10),
+        _record(START + timedelta(minutes=56), currentPowerConsumption=300),
+        _record(START + timedelta(hours=1), currentPowerConsumption=50),
+        _record(START + timedelta(hours=2), currentPowerConsumption=999),
+        {"currentPowerConsumption": 999},
+    ]
+
+    statistics = aggregate_history(
+        records, PUMP_FIELDS, START, START + timedelta(hours=2)
+    )
+
+    assert statistics == {
+        "current_power_consumption": [
+            {"start": START, "mean": 200, "min": 100, "max": 300},
+            {"start": START + timedelta(hours=1), "mean": 50, "min": 50, "max": 50},
+        ],
+        "current_motor_speed": [],
+        "current_estimated_flow": [
+            {"start": START, "mean": 10, "min": 10, "max": 10},
+        ],
+    }
+
+
+async def test_backfill_imports_one_batch_per_chunk_and_key(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    coordinator: PentairDataUpdateCoordinator,
+) -> None:
+    """Test history is fetched in chunks and each chunk is one import per key."""
+    end = START + timedelta(hours=54, minutes=30)
+
+    with patch(
+        "custom_components.pentair_cloud.backfill.async_add_external_statistics"
+    ) as add_external:
+        await async_backfill_statistics(
+            hass, coordinator, START + timedelta(minutes=30), end
+        )
+
+    pump_calls = [call for call in coordinator.api.calls if call[0] == "pump"]
+    assert [(start, end) for _, start, end in pump_calls] == [
+        (START, START + BACKFILL_CHUNK),
+        (START + BACKFILL_CHUNK, START + 2 * BACKFILL_CHUNK),
+        (START + 2 * BACKFILL_CHUNK, START + timedelta(hours=55)),
+    ]
+    assert len(coordinator.api.calls) == 2 * len(pump_calls)
+
+    imported: dict[str, list] = {}
+    for call in add_external.call_args_list:
+        imported.setdefault(call.args[1]["statistic_id"], []).append(call.args[2])
+    assert {
+        statistic_id: [len(rows) for rows in batches]
+        for statistic_id, batches in imported.items()
+    } == {
+        f"{DOMAIN}:pump_current_power_consumption": [24, 24, 7],
+        f"{DOMAIN}:pump_current_motor_speed": [24, 24, 7],
+        f"{DOMAIN}:pump_current_estimated_flow": [24, 24, 7],
+        f"{DOMAIN}:salt_salt_level": [24, 24, 7],
+    }
+
+
+async def test_backfill_registered_sensors(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    coordinator: PentairDataUpdateCoordinator,
+) -> None:
+    """Test registered sensors get recorder statistics in their displayed unit."""
+    registry = er.async_get(hass)
+    for device_id, key in (
+        ("pump", "current_power_consumption"),
+        ("pump", "current_motor_speed"),
+        ("salt", "salt_level"),
+    ):
+        registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            f"{device_id}-{key}",
+            capabilities={"state_class": "measurement"},
+            suggested_object_id=f"{device_id}_{key}",
+        )
+    registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "pump-current_estimated_flow",
+        suggested_object_id="pump_current_estimated_flow",
+    )
+    hass.states.async_set(
+        "sensor.pump_current_power_consumption", "1.0", {"unit_of_measurement": "kW"}
+    )
+    hass.states.async_set(
+        "sensor.pump_current_motor_speed", "50", {"unit_of_measurement": "%"}
+    )
+
+    with patch(
+        "custom_components.pentair_cloud.backfill.async_add_external_statistics"
+    ) as add_external, patch(
+        "custom_components.pentair_cloud.backfill.async_import_statistics"
+    ) as import_statistics:
+        await async_backfill_statistics(
+            hass, coordinator, START, START + timedelta(hours=2)
+        )
+
+    imported = {
+        call.args[1]["statistic_id"]: call.args
+        for call in import_statistics.call_args_list
+    }
+    assert set(imported) == {
+        "sensor.pump_current_power_consumption",
+        "sensor.pump_current_motor_speed",
+        "sensor.salt_salt_level",
+    }
+    _, metadata, rows = imported["sensor.pump_current_power_consumption"]
+    assert metadata["source"] == "recorder"
+    assert metadata["name"] is None
+    assert metadata["unit_of_measurement"] == "kW"
+    assert [row["mean"] for row in rows] == [pytest.approx(1.0), pytest.approx(1.001)]
+    _, metadata, rows = imported["sensor.salt_salt_level"]
+    assert metadata["unit_of_measurement"] is None
+    assert [row["mean"] for row in rows] == [80, 80]
+
+    # Registered without a state class, so the recorder keeps no statistics for it.
+    assert not add_external.called
+
+
+async def test_backfill_ends_at_last_completed_hour(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    coordinator: PentairDataUpdateCoordinator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the hour still being recorded is never backfilled."""
+    freezer.move_to(START + timedelta(hours=5, minutes=30))
+
+    with patch(
+        "custom_components.pentair_cloud.backfill.async_add_external_statistics"
+    ) as add_external:
+        await async_backfill_statistics(
+            hass, coordinator, START, START + timedelta(hours=10)
+        )
+
+    assert {call[1:] for call in coordinator.api.calls} == {
+        (START, START + timedelta(hours=5))
+    }
+    assert {len(call.args[2]) for call in add_external.call_args_list} == {5}
+
+    with pytest.raises(HomeAssistantError):
+        await async_backfill_statistics(
+            hass, coordinator, START + timedelta(hours=5), START + timedelta(hours=6)
+        )
+
+
+async def test_backfill_rerun_does_not_duplicate(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    coordinator: PentairDataUpdateCoordinator,
+) -> None:
+    """Test backfilling the same range twice leaves the same statistics."""
+    end = START + timedelta(hours=30)
+    statistic_ids = {
+        f"{DOMAIN}:pump_current_power_consumption",
+        f"{DOMAIN}:salt_salt_level",
+    }
+
+    await async_backfill_statistics(hass, coordinator, START, end)
+    first = await _statistics(hass, START, end, statistic_ids)
+    await async_backfill_statistics(hass, coordinator, START, end)
+    second = await _statistics(hass, START, end, statistic_ids)
+
+    assert {key: len(rows) for key, rows in first.items()} == {
+        statistic_id: 30 for statistic_id in statistic_ids
+    }
+    assert second == first
+
+
+async def test_backfill_service(recorder_mock: Recorder, hass: HomeAssistant) -> None:
+    """Test the service backfills the entities of every loaded entry."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"username": "test"})
+    entry.add_to_hass(hass)
+    with patch(
+        "pypentair.Pentair",
+        return_value=FakePentairCloud(_history(3)),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    statistic_ids = {
+        registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+        for unique_id in ("pump-current_power_consumption", "salt-salt_level")
+    }
+    end = START + timedelta(hours=3)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKFILL_STATISTICS,
+        {ATTR_START_TIME: START, ATTR_END_TIME: end},
+        blocking=True,
+    )
+
+    statistics = await _statistics(hass, START, end, statistic_ids)
+    assert {key: len(rows) for key, rows in statistics.items()} == {
+        statistic_id: 3 for statistic_id in statistic_ids
+    }
+
+
+async def test_backfill_service_without_history(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test the service fails when the client cannot fetch device history."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"username": "test"})
+    entry.add_to_hass(hass)
+    with patch("pypentair.Pentair", return_value=FakePentair()):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BACKFILL_STATISTICS,
+            {ATTR_START_TIME: START},
+            blocking=True,
+        )
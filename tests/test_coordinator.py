@@ -0,0 +1,100 @@
+"""Tests for the Pentair coordinator."""
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.pentair_cloud.coordinator import PentairDataUpdateCoordinator
+from homeassistant.core import HomeAssistant
+
+START = 1_700_000_000.0
+
+
+def _pump(report_time: float, power: float) -> SimpleNamespace:
+    """Return a pump device reporting `power` watts at `report_time`."""
+    return SimpleNamespace(
+        deviceId="pump",
+        deviceType="IF31",
+        lastReport=report_time,
+        currentPowerConsumption=power,
+    )
+
+
+def _poll(
+    coordinator: PentairDataUpdateCoordinator,
+    now: float,
+    report_time: float,
+    power: float,
+) -> None:
+    """Simulate a successful poll at `now`."""
+    coordinator.devices = [_pump(report_time, power)]
+    with patch("custom_components.pentair_cloud.coordinator.time", return_value=now):
+        coordinator._integrate_energy()  # pylint: disable=protected-access
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant) -> PentairDataUpdateCoordinator:
+    """Return a coordinator without a client."""
+    return PentairDataUpdateCoordinator(hass, client=None)
+
+
+async def test_energy_holds_power_across_rare_reports(coordinator) -> None:
+    """Test a steady pump that reports rarely is counted while polls succeed."""
+    _poll(coordinator, START, START, 1000)
+    for second in range(30, 3600, 30):
+        _poll(coordinator, START + second, START, 1000)
+    _poll(coordinator, START + 3600, START + 3600, 500)
+
+    assert coordinator.get_energy("pump") == pytest.approx(1.0)
+
+
+async def test_energy_skips_missed_polls(coordinator) -> None:
+    """Test power across missed polls is not counted, and counting then resumes."""
+    _poll(coordinator, START, START, 1000)
+    _poll(coordinator, START + 30, START, 1000)
+    _poll(coordinator, START + 3600, START + 3600, 500)
+    assert coordinator.get_energy("pump") == 0
+
+    _poll(coordinator, START + 3630, START + 3630, 500)
+    assert coordinator.get_energy("pump") == pytest.approx(500 * 30 / 3_600_000)
+
+
+async def test_energy_ignores_clock_skew(coordinator) -> None:
+    """Test the local clock being far off the cloud's does not change the total."""
+    skew = -86_400
+    _poll(coordinator, START + skew, START, 1000)
+    for second in range(30, 3600, 30):
+        _poll(coordinator, START + skew + second, START, 1000)
+    _poll(coordinator, START + skew + 3600, START + 3600, 500)
+
+    assert coordinator.get_energy("pump") == pytest.approx(1.0)
+
+
+async def test_energy_restored_once(coordinator) -> None:
+    """Test restoring a total only seeds it once and never adds to it."""
+    _poll(coordinator, START, START, 1000)
+    coordinator.restore_energy("pump", 10.0)
+    _poll(coordinator, START + 30, START + 30, 1000)
+    coordinator.restore_energy("pump", 10.0)
+
+    assert coordinator.get_energy("pump") == pytest.approx(10.0 + 1000 * 30 / 3_600_000)
+
+
+async def test_update_logs_diff_when_debugging(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the device diff is only computed with debug logging enabled."""
+    device = _pump(START, 1000)
+    client = SimpleNamespace(get_devices=lambda: [device], get_device=lambda _: device)
+    coordinator = PentairDataUpdateCoordinator(hass, client=client)
+
+    caplog.set_level(logging.INFO, logger="custom_components.pentair_cloud")
+    assert await coordinator._async_update_data() == [device]
+    assert "Devices updated" not in caplog.text
+
+    caplog.set_level(logging.DEBUG, logger="custom_components.pentair_cloud")
+    await coordinator._async_update_data()
+    assert "Devices updated: no changes" in caplog.text
@@ -0,0 +1,48 @@
+"""Tests for the Pentair integration's import footprint."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+from custom_components.pentair_cloud import PLATFORMS
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = ROOT / "custom_components" / "pentair_cloud"
+
+LAZY_MODULES = (
+    "deepdiff",
+    "pypentair",
+    "custom_components.pentair_cloud.backfill",
+)
+
+
+def test_import_does_not_load_lazy_modules() -> None:
+    """Test loading the integration and its platforms leaves heavy modules alone."""
+    modules = [
+        "custom_components.pentair_cloud",
+        "custom_components.pentair_cloud.config_flow",
+        *(
+            f"custom_components.pentair_cloud.{platform}"
+            for platform in PLATFORMS
+            if (PACKAGE / f"{platform}.py").exists()
+        ),
+    ]
+    snippet = (
+        "import importlib, json, sys\n"
+        "import homeassistant.core\n"
+        f"for module in {modules!r}:\n"
+        "    importlib.import_module(module)\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    assert json.loads(result.stdout) == []